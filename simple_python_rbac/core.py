@@ -1,15 +1,74 @@
-from functools import wraps
-from typing import List, Dict, Optional, Callable, Any, Set
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache, wraps
+from typing import List, Dict, Optional, Callable, Any, Set, Tuple
+import bisect
+import fnmatch
 import glob
+import os
+import sys
 import yaml
 from .exceptions import PermissionError
 
+try:
+    # libyaml-backed loader, considerably faster than the pure-Python one.
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 try:
     import streamlit as st
 except ImportError:
     st = None
 
+# Cap on cached (role, permission) verdicts, so apps checking dynamically
+# built permission strings don't grow the cache for the life of the process.
+_PERM_CACHE_MAX = 4096
+
+@lru_cache(maxsize=4096)
+def _perm_segments(perm: str) -> Tuple[str, ...]:
+    """Splits a dotted permission once and memoizes the segments."""
+    return tuple(perm.split("."))
+
+def _build_trie(perms: List[str]) -> Dict[str, Any]:
+    """
+    Builds a nested-dict trie from dotted permission strings.
+    Each node maps a segment to its child node. Sentinel keys:
+    - "__wild__": a trailing wildcard segment ('app.*') was defined at this level,
+      matching everything below.
+    - "__end__": a permission ends exactly at this node.
+    A '*' anywhere but the final segment ('app.*.get') is stored as a literal
+    segment and only ever matches itself, as in the pre-trie matcher.
+    """
+    root: Dict[str, Any] = {}
+    for perm in perms:
+        node = root
+        segments = perm.split(".")
+        for i, segment in enumerate(segments):
+            if segment == "*" and i == len(segments) - 1:
+                node["__wild__"] = True
+                break
+            node = node.setdefault(sys.intern(segment), {})
+        else:
+            node["__end__"] = True
+    _prune_trie(root)
+    return root
+
+def _prune_trie(node: Dict[str, Any]):
+    """
+    Minimizes a trie in place: branches below a wildcard node can never be
+    reached (the walk stops at '__wild__'), so they are dropped.
+    """
+    if node.get("__wild__"):
+        for key in [k for k in node if k not in ("__wild__", "__end__")]:
+            del node[key]
+        return
+    for key, child in node.items():
+        if key not in ("__wild__", "__end__"):
+            _prune_trie(child)
+
 class RoleConfig:
+    __slots__ = ("role_name", "description", "permissions", "permission_sets")
+
     def __init__(self, role_name: str, description: Optional[str] = None, permissions: List[str] = None, permission_sets: List[str] = None):
         self.role_name = role_name
         self.description = description
@@ -17,15 +76,89 @@ class RoleConfig:
         self.permission_sets = permission_sets or []
 
 class RBACManager:
+    # Class-level default lets the re-init guard below be a plain attribute
+    # read instead of a hasattr probe.
+    _initialized = False
+
     def __init__(self):
-        if hasattr(self, '_initialized') and self._initialized:
+        if self._initialized:
             return
         self._initialized = True
         self.roles_db: Dict[str, RoleConfig] = {}
         self.permission_sets_db: Dict[str, List[str]] = {}
+        self._merged_perms: Dict[str, Tuple[str, ...]] = {}
+        self._is_superuser: Dict[str, bool] = {}
+        self._exact_perms: Dict[str, frozenset] = {}
+        self._role_tries: Dict[str, Dict[str, Any]] = {}
+        self._perm_cache: Dict[Tuple[str, str], bool] = {}
+        self._index_roles: Dict[str, RoleConfig] = {}
+        self._indexes_dirty = False
         self._current_role_provider: Optional[Callable[[], Optional[str]]] = None
         self.default_on_fail: Optional[Callable[[str], Any]] = None
 
+    def _mark_dirty(self):
+        """
+        Flags the per-role indexes as stale after a mutation. The rebuild is
+        deferred to the next permission check, so a batch of set_roles /
+        set_permission_sets / load_* calls pays for one rebuild, not one each.
+        """
+        self._perm_cache.clear()
+        self._indexes_dirty = True
+
+    def _cache_store(self, key: Tuple[str, str], value: bool) -> bool:
+        """Stores a verdict, evicting the oldest entry once the cap is hit."""
+        cache = self._perm_cache
+        if len(cache) >= _PERM_CACHE_MAX:
+            # Dicts preserve insertion order, so this drops the oldest key.
+            cache.pop(next(iter(cache)))
+        cache[key] = value
+        return value
+
+    def invalidate(self):
+        """
+        Discards the cached permission indexes and verdicts.
+        Call after editing roles_db or permission_sets_db contents in place
+        (e.g. appending to a role's permissions list); adding or replacing
+        entries is detected automatically, in-place edits are not.
+        """
+        self._mark_dirty()
+
+    def _ensure_indexes(self, role_name: str, role_config: RoleConfig):
+        """
+        Rebuilds the per-role indexes if a setter flagged them stale, or if
+        roles_db was mutated directly and the checked role's RoleConfig is no
+        longer the object the indexes were built from. In-place edits to an
+        existing RoleConfig or permission set list are not detectable here;
+        they require invalidate().
+        """
+        if self._indexes_dirty or self._index_roles.get(role_name) is not role_config:
+            self._rebuild_merged()
+
+    def _rebuild_merged(self):
+        """
+        Rebuilds the per-role indexes: the merged (direct + permission set)
+        permission tuples and the tries derived from them.
+        """
+        self._indexes_dirty = False
+        self._perm_cache.clear()
+        self._merged_perms.clear()
+        self._is_superuser.clear()
+        self._exact_perms.clear()
+        self._role_tries.clear()
+        self._index_roles = dict(self.roles_db)
+        for role_name, role_config in self.roles_db.items():
+            # Interned strings share storage and compare by pointer on the
+            # exact-match fast path.
+            merged = tuple(sys.intern(p) for p in role_config.permissions) + tuple(
+                sys.intern(perm)
+                for ps_name in role_config.permission_sets
+                for perm in self.permission_sets_db.get(ps_name, ())
+            )
+            self._merged_perms[role_name] = merged
+            self._is_superuser[role_name] = "*" in merged
+            self._exact_perms[role_name] = frozenset(p for p in merged if not p.endswith("*"))
+            self._role_tries[role_name] = _build_trie(merged)
+
     def set_roles(self, roles: List[Dict[str, Any]]):
         """
         Set roles from a list of dictionaries.
@@ -41,27 +174,56 @@ class RBACManager:
                     permissions=role_data.get('permissions'),
                     permission_sets=role_data.get('permission_sets')
                 )
+        self._mark_dirty()
 
     def set_permission_sets(self, permission_sets: Dict[str, List[str]]):
         """
         Sets the permission sets database.
         """
         self.permission_sets_db = permission_sets
+        self._mark_dirty()
 
     def load_roles_from_yaml(self, folder_path: str = "roles/*.yaml"):
         """
         Loads and validates all YAML files from a specified folder.
         """
-        files = glob.glob(folder_path)
+        folder, pattern = os.path.split(folder_path)
+        if glob.has_magic(folder):
+            # Wildcards in the directory part (e.g. 'tenants/*/role.yaml')
+            # need the full glob machinery.
+            files = sorted(glob.glob(folder_path))
+        else:
+            try:
+                with os.scandir(folder or ".") as entries:
+                    files = sorted(
+                        entry.path
+                        for entry in entries
+                        if entry.is_file()
+                        # Like glob: hidden files only match patterns that
+                        # themselves start with a dot.
+                        and (pattern.startswith(".") or not entry.name.startswith("."))
+                        and fnmatch.fnmatch(entry.name, pattern)
+                    )
+            except OSError:
+                files = []
         if not files:
             print(f"RBAC Warning: No YAML files found in {folder_path}")
+            return
+
+        def parse_file(file):
+            # One read call per file; yaml decodes the bytes itself.
+            with open(file, 'rb') as f:
+                data = yaml.load(f.read(), Loader=_YamlLoader)
+            # Create RoleConfig from dictionary data
+            return RoleConfig(**data)
 
-        for file in files:
-            with open(file, 'r', encoding='utf-8') as f:
+        # Files are independent, so parse them in parallel; results are
+        # applied in file order to keep overrides deterministic.
+        with ThreadPoolExecutor(max_workers=min(8, len(files))) as executor:
+            futures = [executor.submit(parse_file, file) for file in files]
+            for file, future in zip(files, futures):
                 try:
-                    data = yaml.safe_load(f)
-                    # Create RoleConfig from dictionary data
-                    role = RoleConfig(**data)
+                    role = future.result()
                     self.roles_db[role.role_name] = role
                 except Exception as e:
                     msg = f"RBAC Error: Failed to load role from {file}: {e}"
@@ -69,6 +231,7 @@ class RBACManager:
                         st.error(msg)
                     else:
                         print(msg)
+        self._mark_dirty()
 
     def load_permission_sets_from_yaml(self, file_path: str = "permission_sets.yaml"):
         """
@@ -77,7 +240,7 @@ class RBACManager:
         """
         try:
             with open(file_path, 'r', encoding='utf-8') as f:
-                data = yaml.safe_load(f)
+                data = yaml.load(f, Loader=_YamlLoader)
                 if isinstance(data, dict):
                     self.set_permission_sets(data)
         except Exception as e:
@@ -95,16 +258,20 @@ class RBACManager:
         """
         warnings = []
 
+        # Sorting once lets every wildcard prefix be resolved with a binary
+        # search instead of a scan over all defined permissions.
+        sorted_defined = sorted(defined_permissions)
+
         # Validate permission sets
         for ps_name, ps_perms in self.permission_sets_db.items():
             for perm in ps_perms:
-                self._check_permission_validity(perm, f"PermissionSet '{ps_name}'", defined_permissions, warnings)
+                self._check_permission_validity(perm, f"PermissionSet '{ps_name}'", defined_permissions, sorted_defined, warnings)
 
         # Validate roles
         for role_name, role_config in self.roles_db.items():
             # Validate direct permissions
             for perm in role_config.permissions:
-                self._check_permission_validity(perm, f"Role '{role_name}'", defined_permissions, warnings)
+                self._check_permission_validity(perm, f"Role '{role_name}'", defined_permissions, sorted_defined, warnings)
 
             # Validate permission set references
             for ps_name in role_config.permission_sets:
@@ -113,7 +280,7 @@ class RBACManager:
 
         return warnings
 
-    def _check_permission_validity(self, perm: str, context: str, defined_permissions: Set[str], warnings: List[str]):
+    def _check_permission_validity(self, perm: str, context: str, defined_permissions: Set[str], sorted_defined: List[str], warnings: List[str]):
         """Helper to validate a single permission string."""
         if perm == "*":
             return
@@ -121,8 +288,10 @@ class RBACManager:
         # Check hierarchical wildcards
         if perm.endswith(".*"):
             prefix = perm[:-2]
-            # Check if any defined permission starts with this prefix
-            has_match = any(p.startswith(prefix) for p in defined_permissions)
+            # Binary search: if anything starts with the prefix, the first
+            # candidate at the insertion point does.
+            idx = bisect.bisect_left(sorted_defined, prefix)
+            has_match = idx < len(sorted_defined) and sorted_defined[idx].startswith(prefix)
             if not has_match:
                 warnings.append(f"{context}: Prefix '{perm}' does not match any code structure.")
             return
@@ -137,23 +306,24 @@ class RBACManager:
         """
         self._current_role_provider = provider
 
-    def _match_permission(self, user_perms: List[str], required_perm: str) -> bool:
+    def _match_permission(self, trie: Dict[str, Any], required_perm: str) -> bool:
         """
-        Hierarchical matching logic:
+        Hierarchical matching logic, walking the role's permission trie:
         - Exact match: 'app.home.get' == 'app.home.get'
         - Wildcard match: 'app.*' allows 'app.home.get'
+        One walk over the permission's segments, independent of how many rules the role has.
+        Wildcards are whole trailing segments: partial-segment patterns like
+        'app.ho*' no longer prefix-match (they did before the trie) and are
+        treated as exact strings.
         """
-        if "*" in user_perms:
-            return True
-
-        for perm in user_perms:
-            if perm == required_perm:
+        node = trie
+        for segment in _perm_segments(required_perm):
+            if node.get("__wild__"):
                 return True
-            if perm.endswith("*"):
-                prefix = perm[:-1]
-                if required_perm.startswith(prefix):
-                    return True
-        return False
+            node = node.get(segment)
+            if node is None:
+                return False
+        return "__end__" in node
 
     def has_permission(self, required_perm: str, role_name: Optional[str] = None) -> bool:
         """
@@ -165,18 +335,71 @@ class RBACManager:
             else:
                 return False
 
-        if not role_name or role_name not in self.roles_db:
+        if not role_name:
+            return False
+
+        role_config = self.roles_db.get(role_name)
+        if role_config is None:
             return False
 
-        role_config = self.roles_db[role_name]
-        user_perms = list(role_config.permissions)
+        # Must run before the cache probe: a rebuild clears stale verdicts.
+        self._ensure_indexes(role_name, role_config)
+
+        key = (role_name, required_perm)
+        cached = self._perm_cache.get(key)
+        if cached is not None:
+            return cached
+
+        if self._is_superuser.get(role_name):
+            return self._cache_store(key, True)
 
-        # Add permissions from permission sets
-        for ps_name in role_config.permission_sets:
-            if ps_name in self.permission_sets_db:
-                user_perms.extend(self.permission_sets_db[ps_name])
+        exact = self._exact_perms.get(role_name)
+        if exact is not None and required_perm in exact:
+            return self._cache_store(key, True)
 
-        return self._match_permission(user_perms, required_perm)
+        return self._cache_store(key, self._match_permission(self._role_tries[role_name], required_perm))
+
+    def has_permissions(self, required_perms: List[str], role_name: Optional[str] = None) -> Dict[str, bool]:
+        """
+        Batch version of has_permission: checks many permissions for one role
+        in a single pass and returns {permission: allowed}.
+        Role resolution and the per-role indexes are looked up once instead of
+        per permission, which matters for bulk validation workloads.
+        """
+        if role_name is None:
+            if self._current_role_provider:
+                role_name = self._current_role_provider()
+            else:
+                return {perm: False for perm in required_perms}
+
+        if not role_name:
+            return {perm: False for perm in required_perms}
+
+        role_config = self.roles_db.get(role_name)
+        if role_config is None:
+            return {perm: False for perm in required_perms}
+
+        self._ensure_indexes(role_name, role_config)
+
+        if self._is_superuser.get(role_name):
+            return {perm: True for perm in required_perms}
+
+        trie = self._role_tries[role_name]
+        exact = self._exact_perms.get(role_name, frozenset())
+        cache = self._perm_cache
+        match = self._match_permission
+
+        results = {}
+        for perm in required_perms:
+            if perm in exact:
+                results[perm] = True
+                continue
+            key = (role_name, perm)
+            cached = cache.get(key)
+            if cached is None:
+                cached = self._cache_store(key, match(trie, perm))
+            results[perm] = cached
+        return results
 
     def get_object_restrictions(self, role_name: str, object_type: str) -> Any:
         """
@@ -192,9 +415,15 @@ class RBACManager:
         If not provided, it uses the default_on_fail if set.
         """
         def decorator(func):
+            # Bound once at decoration time so each call skips the attribute
+            # lookups on self. The access decision stays entirely inside
+            # has_permission, which answers repeat checks from its cache and
+            # performs the role-existence checks a raw cache probe would skip.
+            has_permission = self.has_permission
+
             @wraps(func)
             def wrapper(*args, **kwargs):
-                if self.has_permission(permission):
+                if has_permission(permission):
                     return func(*args, **kwargs)
 
                 fail_handler = on_fail or self.default_on_fail
@@ -4,13 +4,22 @@ class Permissions:
     """
     pass
 
+_permissions_cache = {}
+
 def get_all_permissions(cls):
-    """Recursively scans a class and returns a set of all permission strings."""
-    perms = set()
+    """
+    Scans a class and returns a frozenset of all permission strings.
+    Walks nested classes with an explicit stack instead of recursion and
+    caches the result per class, since permission classes are static.
+    """
+    cached = _permissions_cache.get(cls)
+    if cached is not None:
+        return cached
 
-    def _scan(obj):
-        # We use __dict__ instead of vars() for better compatibility if needed, 
-        # but vars() is fine too.
+    perms = set()
+    stack = [cls]
+    while stack:
+        obj = stack.pop()
         for name, value in vars(obj).items():
             if name.startswith("_"):
                 continue
@@ -18,7 +27,8 @@ def get_all_permissions(cls):
             if isinstance(value, str):
                 perms.add(value)
             elif isinstance(value, type):
-                _scan(value)
+                stack.append(value)
 
-    _scan(cls)
-    return perms
+    result = frozenset(perms)
+    _permissions_cache[cls] = result
+    return result
@@ -114,6 +114,39 @@ class TestRBAC(unittest.TestCase):
             
         self.assertEqual(protected_func(), "Global fail: some.perm")
 
+    def test_non_terminal_wildcard_is_literal(self):
+        self.rbac.set_roles([{"role_name": "odd", "permissions": ["app.*.get"]}])
+        self.assertTrue(self.rbac.has_permission("app.*.get", "odd"))
+        self.assertFalse(self.rbac.has_permission("app.home.get", "odd"))
+        self.assertFalse(self.rbac.has_permission("app.home", "odd"))
+
+    def test_partial_segment_wildcard_is_literal(self):
+        self.rbac.set_roles([{"role_name": "odd", "permissions": ["app*", "app.ho*"]}])
+        self.assertTrue(self.rbac.has_permission("app*", "odd"))
+        self.assertTrue(self.rbac.has_permission("app.ho*", "odd"))
+        # Wildcards are whole trailing segments; these prefix-matched before the trie.
+        self.assertFalse(self.rbac.has_permission("application.x", "odd"))
+        self.assertFalse(self.rbac.has_permission("app.home", "odd"))
+
+    def test_wildcard_does_not_grant_parent(self):
+        self.rbac.set_roles([{"role_name": "odd", "permissions": ["app.*"]}])
+        self.assertTrue(self.rbac.has_permission("app.home", "odd"))
+        self.assertFalse(self.rbac.has_permission("app", "odd"))
+
+    def test_invalidate_after_in_place_edit(self):
+        self.assertTrue(self.rbac.has_permission(MyPermissions.App.GET, "viewer"))
+        self.rbac.roles_db["viewer"].permissions.remove(MyPermissions.App.GET)
+        self.rbac.invalidate()
+        self.assertFalse(self.rbac.has_permission(MyPermissions.App.GET, "viewer"))
+
+    def test_has_permissions_batch(self):
+        results = self.rbac.has_permissions(
+            [MyPermissions.App.GET, MyPermissions.App.LIST, "admin.all"], "editor"
+        )
+        self.assertEqual(results, {"app.get": True, "app.list": True, "admin.all": False})
+        self.assertTrue(all(self.rbac.has_permissions(["x.y", "z"], "admin").values()))
+        self.assertFalse(any(self.rbac.has_permissions(["app.get"], "ghost").values()))
+
     def test_permission_sets(self):
         # Setup permission sets
         permission_sets = {